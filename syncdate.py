@@ -10,11 +10,14 @@
 #
 # Requires: exiftool in PATH (or bundled). Hidden files skipped.
 
-import argparse, json, os, re, shutil, subprocess, sys
+import atexit, json, os, re, shutil, subprocess, sys, tempfile, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+if TYPE_CHECKING:
+    import argparse  # imported lazily in build_parser() at runtime
 
 APP_NAME = "rstoredate"
 VERSION = "2.3.0"
@@ -35,13 +38,24 @@ def _enable_ansi():
             pass
 _enable_ansi()
 
+try:
+    import orjson  # type: ignore
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+_IS_TTY = sys.stdout.isatty()
+
 def c(text: str, color: str) -> str:
-    if sys.stdout.isatty():
-        return f"{color}{text}{Colors.RESET}"
-    return text
+    return f"{color}{text}{Colors.RESET}" if _IS_TTY else text
+
+# per-file status prefixes, decorated once
+OK_PREFIX   = c("[OK] ", Colors.GREEN)
+FAIL_PREFIX = c("[FAIL] ", Colors.RED)
 
 # ---------- Tag priorities ----------
-VIDEO_TAG_PRIORITY = [
+# Embedded date tags considered when picking a date, highest priority first.
+VIDEO_TAG_PRIORITY = (
     "QuickTime:CreationDate",
     "ItemList:ContentCreateDate",
     "Keys:CreationDate",
@@ -50,25 +64,51 @@ VIDEO_TAG_PRIORITY = [
     "QuickTime:CreateDate",
     "QuickTime:MediaCreateDate",
     "QuickTime:TrackCreateDate",
-    "H264:DateTimeOriginal",
     "XMP:CreateDate",
     "XMP:DateCreated",
-]
-PHOTO_TAG_PRIORITY = [
+    "H264:DateTimeOriginal",
+)
+PHOTO_TAG_PRIORITY = (
     "EXIF:DateTimeOriginal",
     "EXIF:CreateDate",
     "XMP:CreateDate",
     "XMP:DateCreated",
     "QuickTime:CreationDate",
     "PNG:CreationTime",
-]
+)
+OTHER_TAG_PRIORITY = (
+    "EXIF:DateTimeOriginal",
+    "EXIF:CreateDate",
+    "QuickTime:CreationDate",
+    "QuickTime:CreateDate",
+    "XMP:CreateDate",
+    "XMP:DateCreated",
+)
+# exiftool_json query: only the tags pick_best_time_tag can use (deduplicated, order kept)
+WANTED_TAGS = tuple(f"-{t}" for t in dict.fromkeys(
+    (*VIDEO_TAG_PRIORITY, *PHOTO_TAG_PRIORITY, *OTHER_TAG_PRIORITY, "System:FileModifyDate")))
+
+VIDEO_EXTS = frozenset({".mp4",".mov",".m4v",".3gp",".3g2",".avi",".mts",".m2ts",".wmv"})
+PHOTO_EXTS = frozenset({".jpg",".jpeg",".heic",".heif",".png",".tif",".tiff",".webp",".dng",".cr2",".nef",".arw",".rw2"})
+
+KIND_OTHER, KIND_VIDEO, KIND_PHOTO = 0, 1, 2
 
-VIDEO_EXTS = {".mp4",".mov",".m4v",".3gp",".3g2",".avi",".mts",".m2ts",".wmv"}
-PHOTO_EXTS = {".jpg",".jpeg",".heic",".heif",".png",".tif",".tiff",".webp",".dng",".cr2",".nef",".arw",".rw2"}
+class FileEntry(NamedTuple):
+    """A target file with its stem, lower-cased suffix and media kind computed once at discovery."""
+    path: Path
+    suffix: str
+    is_hidden: bool
+    kind: int
+    stem: str
+
+def file_entry(p: Path, name: Optional[str] = None) -> FileEntry:
+    """'name' lets scandir callers pass DirEntry.name and skip re-parsing the Path."""
+    name = p.name if name is None else name
+    stem, suffix = os.path.splitext(name)  # split once, same rule as build_source_index
+    suffix = suffix.lower()
+    kind = KIND_VIDEO if suffix in VIDEO_EXTS else KIND_PHOTO if suffix in PHOTO_EXTS else KIND_OTHER
+    return FileEntry(p, suffix, name.startswith("."), kind, stem)
 
-def is_hidden(p: Path) -> bool: return p.name.startswith(".")
-def is_video(p: Path) -> bool:  return p.suffix.lower() in VIDEO_EXTS
-def is_photo(p: Path) -> bool:  return p.suffix.lower() in PHOTO_EXTS
 
 # ---------- ExifTool helpers ----------
 def ensure_exiftool():
@@ -76,15 +116,229 @@ def ensure_exiftool():
         sys.stderr.write(c("ERROR: 'exiftool' not found in PATH.\n", Colors.RED))
         sys.exit(1)
 
+def split_status(err: bytes, out: bytes) -> Tuple[int, bytes]:
+    """
+    Split the trailing '=<status>' written by our -echo4 marker off captured stderr.
+    """
+    err, _, status = err.rpartition(b"=")
+    if status.strip().isdigit():
+        return int(status), err
+    # ${status} is empty on very old exiftool builds; sniff the output instead (an -if miss
+    # only shows up as 'files failed condition' on stdout, which is status 2)
+    return (2 if b"failed condition" in out else 1 if b"Error" in err else 0), err
+
+def argfile_line(arg: str) -> str:
+    """
+    One argument as an exiftool argfile line. Plain lines lose surrounding whitespace and a
+    leading '#' makes them a comment, so such arguments are sent as '#[CSTR]' C strings.
+    """
+    if "\n" in arg or "\r" in arg:
+        raise ValueError(f"exiftool argument can't contain a line break: {arg!r}")
+    if arg != arg.strip() or arg.startswith("#"):
+        return "#[CSTR]" + arg.replace("\\", "\\\\")
+    return arg
+
+def argfile_error(arg: str) -> Optional[str]:
+    """Why 'arg' can't be sent in an argfile (a line break, an unencodable name), else None."""
+    try:
+        argfile_line(arg).encode("utf-8", "surrogateescape")
+    except ValueError as e:  # UnicodeEncodeError included
+        return str(e)
+    return None
+
+def argfile_bytes(args: List[str]) -> bytes:
+    # surrogateescape gives non-UTF-8 file names back as the raw bytes os.scandir read
+    return ("\n".join(map(argfile_line, args)) + "\n").encode("utf-8", "surrogateescape")
+
+class ExifToolDaemon:
+    """
+    One long-lived 'exiftool -stay_open True -@ -' process. Each command is written as an
+    argument block ending in -execute<seq>; stdout is read up to the {ready<seq>} sentinel and
+    stderr up to an -echo4 marker carrying the command's exit status. stderr is drained by its
+    own thread, so a command with lots of warnings can't fill that pipe and stall exiftool.
+    """
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            ["exiftool", "-stay_open", "True", "-@", "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.seq = 0
+        self._err = bytearray(); self._err_eof = False
+        self._err_cv = threading.Condition()
+        threading.Thread(target=self._drain_stderr, daemon=True).start()
+
+    def _drain_stderr(self):
+        fd = self.proc.stderr.fileno()
+        while True:
+            chunk = os.read(fd, 65536)
+            with self._err_cv:
+                if chunk:
+                    self._err += chunk
+                else:
+                    self._err_eof = True
+                self._err_cv.notify_all()
+            if not chunk:
+                return
+
+    def _read_stdout_until(self, marker: bytes) -> bytes:
+        """Collect chunks until the output ends with 'marker'; only the tail is checked."""
+        fd, chunks, tail = self.proc.stdout.fileno(), [], b""
+        while True:
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise subprocess.CalledProcessError(-1, "exiftool -stay_open", output=b"".join(chunks))
+            chunks.append(chunk)
+            tail = (tail + chunk)[-(len(marker) + 8):]
+            if tail.rstrip().endswith(marker):
+                return b"".join(chunks).rstrip()[:-len(marker)]
+
+    def _read_stderr_until(self, marker: bytes) -> bytes:
+        with self._err_cv:
+            start = 0
+            while True:
+                i = self._err.find(marker, start)
+                if i >= 0:
+                    err = bytes(self._err[:i]); del self._err[:i + len(marker)]
+                    return err.lstrip()
+                if self._err_eof:
+                    raise subprocess.CalledProcessError(-1, "exiftool -stay_open", output=bytes(self._err))
+                start = max(0, len(self._err) - len(marker))
+                self._err_cv.wait()
+
+    def execute(self, args: List[str]) -> Tuple[int, bytes, bytes]:
+        data = argfile_bytes(args)  # may raise ValueError before anything is sent
+        self.seq += 1
+        self.proc.stdin.write(data + argfile_bytes(["-echo4", f"=${{status}}=post{self.seq}", f"-execute{self.seq}"]))
+        self.proc.stdin.flush()
+        out = self._read_stdout_until(f"{{ready{self.seq}}}".encode())
+        code, err = split_status(self._read_stderr_until(f"=post{self.seq}".encode()), out)
+        return code, out, err
+
+    def stop(self):
+        """Ask exiftool to exit after the current command (does not wait)."""
+        if self.proc.poll() is None:
+            try:
+                self.proc.stdin.write(b"-stay_open\nFalse\n"); self.proc.stdin.flush()
+            except OSError:
+                pass
+
+    def close(self):
+        self.stop()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+# One daemon per worker thread, so --jobs workers never share (or lock) a pipe.
+_local = threading.local()
+_daemons: List[ExifToolDaemon] = []
+_daemons_lock = threading.Lock()
+
+def thread_daemon() -> ExifToolDaemon:
+    d = getattr(_local, "daemon", None)
+    if d is None:
+        d = _local.daemon = ExifToolDaemon()
+        with _daemons_lock:
+            _daemons.append(d)
+    return d
+
+@atexit.register
+def close_daemons():
+    # signal every worker's exiftool first so they shut down concurrently, then reap
+    with _daemons_lock:
+        for d in _daemons:
+            d.stop()
+        for d in _daemons:
+            d.close()
+        _daemons.clear()
+
+def run_exiftool(args: List[str], merge_stderr: bool = True) -> bytes:
+    """
+    Drop-in for check_output(["exiftool", *args], stderr=STDOUT) over this thread's daemon.
+    Raises CalledProcessError on a non-zero exiftool status.
+    """
+    status, out, err = thread_daemon().execute(args)
+    if status != 0:
+        raise subprocess.CalledProcessError(status, ["exiftool", *args], output=out + err)
+    return out + err if merge_stderr else out
+
+def run_batch(operations: List[List[str]]) -> List[Tuple[int, bytes, bytes]]:
+    """
+    Run independent exiftool commands in ONE short-lived 'exiftool -@ -' process, separated by
+    -execute. Returns (status, stdout, stderr) per operation, split on -echo3/-echo4 markers.
+    An operation whose markers never arrive (exiftool died part-way) fails, as does every one
+    after it; an operation that can't be encoded fails on its own without being sent.
+    """
+    data: List[bytes] = []; rejected: Dict[int, bytes] = {}
+    for i, op in enumerate(operations):
+        try:
+            data.append(argfile_bytes([*op, "-echo3", f"{{done{i}}}", "-echo4", f"=${{status}}{{post{i}}}", "-execute"]))
+        except ValueError as e:
+            rejected[i] = str(e).encode()
+    proc = subprocess.Popen(["exiftool", "-@", "-"],
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out, err = proc.communicate(b"".join(data))
+    results: List[Tuple[int, bytes, bytes]] = []
+    for i in range(len(operations)):
+        if i in rejected:
+            results.append((1, b"", rejected[i])); continue
+        o, done, out = out.partition(f"{{done{i}}}".encode())
+        e, post, err = err.partition(f"{{post{i}}}".encode())
+        if not (done and post):
+            msg = f"exiftool stopped before finishing this file (exit status {proc.returncode})".encode()
+            results += [(1, b"", rejected.get(j, msg)) for j in range(i, len(operations))]
+            break
+        code, e = split_status(e, o)
+        results.append((code, o.strip(), e.strip()))
+    return results
+
+def parse_json(out: bytes) -> list:
+    if not out.strip():
+        return []
+    try:
+        return json_loads(out)  # bytes straight in, no decode copy
+    except ValueError:  # invalid UTF-8 in some tag value
+        return json.loads(out.decode("utf-8", errors="ignore"))
+
+def alias_groups(tags: Dict[str,str]) -> Dict[str,str]:
+    """
+    -G0:1 keys look like 'EXIF:ExifIFD:DateTimeOriginal'. File each value under both
+    'EXIF:DateTimeOriginal' and 'ExifIFD:DateTimeOriginal', since the priority tuples mix
+    family-0 (EXIF, XMP, QuickTime) and family-1 (Keys, ItemList) group names.
+    """
+    out: Dict[str,str] = {}
+    for k, v in tags.items():
+        parts = k.split(":")
+        if len(parts) == 3:
+            out.setdefault(f"{parts[0]}:{parts[2]}", v)
+            out.setdefault(f"{parts[1]}:{parts[2]}", v)
+        else:
+            out.setdefault(k, v)
+    return out
+
 # Do NOT use -api QuickTimeUTC=1; keep original TZ offsets intact when reading.
 def exiftool_json(path: Path) -> Dict[str,str]:
-    cmd = ["exiftool","-a","-G1","-s","-time:all","-j",str(path)]
-    out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-    data = json.loads(out.decode("utf-8", errors="ignore"))
-    return data[0] if data else {}
+    data = parse_json(run_exiftool(["-G0:1","-s","-j",*WANTED_TAGS,str(path)], merge_stderr=False))
+    return alias_groups(data[0]) if data else {}
+
+def path_key(p) -> str:
+    """Comparable form of a path as we pass it and as exiftool echoes it in SourceFile."""
+    return os.path.normcase(os.path.normpath(str(p)))
+
+def read_all_metadata(paths: List[Union[str, Path]]) -> Dict[str, Dict[str,str]]:
+    """
+    One JSON read for many files -> {path_key(SourceFile): tags}. Files exiftool cannot
+    read, or whose names can't go into an argfile (see argfile_error), are simply absent.
+    """
+    names = [p for p in map(str, paths) if argfile_error(p) is None]
+    if not names:
+        return {}
+    _, out, _ = thread_daemon().execute(["-G0:1","-s","-j",*WANTED_TAGS,*names])
+    return {path_key(d.get("SourceFile", "")): alias_groups(d) for d in parse_json(out)}
 
 TZ_RE = re.compile(r'(Z|[+-]\d{2}:\d{2})$')
 DT_RE = re.compile(r'^(\d{4})[:\-](\d{2})[:\-](\d{2})[ T](\d{2}):(\d{2}):(\d{2})(\.\d+)?(Z|[+-]\d{2}:\d{2})?$')
+DT_TAIL_RE = re.compile(r'^(\.\d+)?(Z|[+-]\d{2}:\d{2})?$')
+OFFSET_RE = re.compile(r'^[+-]\d{2}:\d{2}$')
 
 def normalize_input_datetime(s: str) -> str:
     """
@@ -99,16 +353,29 @@ def normalize_input_datetime(s: str) -> str:
     if not m:
         raise ValueError(f"Unsupported datetime format: {s}")
     y,mo,d,hh,mm,ss,frac, tzs = m.groups()
+    datetime(int(y), int(mo), int(d), int(hh), int(mm), int(ss))  # range check (e.g. month 13)
     out = f"{y}:{mo}:{d} {hh}:{mm}:{ss}"
     if tzs: out += tzs
     return out
 
 def parse_exif_dt(s: str) -> Tuple[datetime, Optional[str], Optional[str]]:
-    m = DT_RE.match(s.strip().replace('T',' '))
-    if not m:
-        raise ValueError(f"Unsupported datetime format: {s}")
-    y,mo,d,hh,mm,ss,frac, tzs = m.groups()
-    dt = datetime(int(y), int(mo), int(d), int(hh), int(mm), int(ss))
+    v = s.strip().replace('T',' ')
+    # fast path: fixed-width 'YYYY:MM:DD HH:MM:SS' head sliced directly, regex only for the tail
+    if (len(v) >= 19 and v[4] in ':-' and v[7] in ':-' and v[10] == ' ' and v[13] == ':' and v[16] == ':'
+            and (v[0:4] + v[5:7] + v[8:10] + v[11:13] + v[14:16] + v[17:19]).isdigit()):
+        frac = tzs = None
+        if len(v) > 19:
+            m = DT_TAIL_RE.match(v[19:])
+            if not m:
+                raise ValueError(f"Unsupported datetime format: {s}")
+            frac, tzs = m.groups()
+        dt = datetime(int(v[0:4]), int(v[5:7]), int(v[8:10]), int(v[11:13]), int(v[14:16]), int(v[17:19]))
+    else:
+        m = DT_RE.match(v)
+        if not m:
+            raise ValueError(f"Unsupported datetime format: {s}")
+        y,mo,d,hh,mm,ss,frac, tzs = m.groups()
+        dt = datetime(int(y), int(mo), int(d), int(hh), int(mm), int(ss))
     if tzs:
         if tzs.upper() == 'Z':
             dt = dt.replace(tzinfo=timezone.utc)
@@ -129,257 +396,414 @@ def apply_time_adjustments(value: str, shift_hours: float = 0.0, set_offset: Opt
     Add/sub hours and/or set timezone suffix (without extra conversion).
     - shift-hours: adjust wall clock by N hours.
     - set-offset: set suffix "+HH:MM" or "Z".
+    Returns 'value' untouched when neither is requested.
     """
+    if not shift_hours and not set_offset:
+        return value
     dt, frac, tzs = parse_exif_dt(value)
     if shift_hours and shift_hours != 0.0:
         dt = dt + timedelta(hours=float(shift_hours))
     if set_offset:
         so = set_offset.strip().upper()
-        if so != 'Z' and not re.match(r'^[+-]\d{2}:\d{2}$', so):
+        if so != 'Z' and not OFFSET_RE.match(so):
             raise ValueError(f"Invalid --set-offset '{set_offset}' (use 'Z' or ±HH:MM)")
         tzs = so
     return fmt_exif_dt(dt, frac, tzs)
 
-def pick_best_time_tag(tags: Dict[str, str], path: Path, allow_system_fallback: bool = False) -> Optional[Tuple[str, str]]:
+LAST_RESORT_SUFFIXES = ("CreateDate", "DateTimeOriginal")
+
+def candidate_tags(kind: int) -> Tuple[str, ...]:
+    if kind == KIND_VIDEO: return VIDEO_TAG_PRIORITY
+    if kind == KIND_PHOTO: return PHOTO_TAG_PRIORITY
+    return OTHER_TAG_PRIORITY
+
+def pick_best_time_tag(tags: Dict[str, str], kind: int, allow_system_fallback: bool = False) -> Optional[Tuple[str, str]]:
     """
     Choose timestamp from *metadata* first. Only if allow_system_fallback=True and
     metadata missing, use System:FileModifyDate.
     """
-    if is_video(path):
-        base = [
-            "QuickTime:CreationDate",
-            "ItemList:ContentCreateDate",
-            "Keys:CreationDate",
-            "EXIF:DateTimeOriginal","EXIF:CreateDate",
-            "QuickTime:CreateDate","QuickTime:MediaCreateDate","QuickTime:TrackCreateDate",
-            "XMP:CreateDate","XMP:DateCreated",
-            "H264:DateTimeOriginal",
-        ]
-    elif is_photo(path):
-        base = [
-            "EXIF:DateTimeOriginal","EXIF:CreateDate",
-            "XMP:CreateDate","XMP:DateCreated",
-            "QuickTime:CreationDate",
-            "PNG:CreationTime",
-        ]
-    else:
-        base = [
-            "EXIF:DateTimeOriginal","EXIF:CreateDate",
-            "QuickTime:CreationDate","QuickTime:CreateDate",
-            "XMP:CreateDate","XMP:DateCreated",
-        ]
-
-    meta_candidates = [(t, str(tags[t]).strip()) for t in base if t in tags and str(tags[t]).strip()]
-    # prefer metadata with explicit TZ
-    for tag, val in meta_candidates:
+    first = None
+    for tag in candidate_tags(kind):
+        val = tags.get(tag)
+        if val is None:
+            continue
+        val = str(val).strip()
+        if not val:
+            continue
+        # prefer metadata with explicit TZ
         if TZ_RE.search(val):
             return tag, val
-    if meta_candidates:
-        return meta_candidates[0]
+        if first is None:
+            first = tag, val
+    if first:
+        return first
     if allow_system_fallback and "System:FileModifyDate" in tags and str(tags["System:FileModifyDate"]).strip():
         return "System:FileModifyDate", str(tags["System:FileModifyDate"]).strip()
     for k, v in tags.items():
-        if (k.endswith("CreateDate") or k.endswith("DateTimeOriginal")) and str(v).strip():
+        if k.endswith(LAST_RESORT_SUFFIXES) and str(v).strip():
             return k, str(v).strip()
     return None
 
 # ---------- Writers ----------
-def set_all_metadata_dates(path: Path, value: str) -> Tuple[bool,str]:
-    """
-    Force ALL common metadata date fields to 'value' (video/photo), then caller should set FS dates too.
-    """
-    if is_photo(path):
-        args = [
-            "-overwrite_original",
-            # EXIF
-            f"-EXIF:DateTimeOriginal={value}",
-            f"-EXIF:CreateDate={value}",
-            f"-EXIF:ModifyDate={value}",
-            # XMP (common)
-            f"-XMP:CreateDate={value}",
-            f"-XMP:DateCreated={value}",
-            # PNG anc
-            f"-PNG:CreationTime={value}",
-            str(path)
-        ]
-    else:
-        args = [
-            "-overwrite_original",
-            # QuickTime family
-            f"-QuickTime:CreateDate={value}",
-            f"-QuickTime:ModifyDate={value}",
-            f"-MediaCreateDate={value}",
-            f"-TrackCreateDate={value}",
-            f"-TrackModifyDate={value}",
-            # iTunes/ItemList & Keys & UserData
-            f"-ItemList:ContentCreateDate={value}",
-            f"-Keys:CreationDate={value}",
-            f"-UserData:CreationDate={value}",
-            # Also set EXIF/XMP for videos when present (some tools read these)
-            f"-EXIF:CreateDate={value}",
-            f"-EXIF:DateTimeOriginal={value}",
-            f"-EXIF:ModifyDate={value}",
-            f"-XMP:CreateDate={value}",
-            f"-XMP:DateCreated={value}",
-            str(path)
-        ]
-    try:
-        out = subprocess.check_output(["exiftool", *args], stderr=subprocess.STDOUT)
-        return True, out.decode("utf-8","ignore").strip()
-    except subprocess.CalledProcessError as e:
-        return False, e.output.decode(errors="ignore")
+# Restore/sync writer tags (not the full "force all") – keeps previous behavior.
+RESTORE_PHOTO_TAGS = [
+    "DateTimeOriginal", "CreateDate", "ModifyDate",
+    "XMP:CreateDate", "XMP:DateCreated",
+]
+RESTORE_VIDEO_TAGS = [
+    "QuickTime:CreateDate", "QuickTime:ModifyDate",
+    "MediaCreateDate", "TrackCreateDate", "TrackModifyDate", "ModifyDate",
+    "ItemList:ContentCreateDate", "Keys:CreationDate",
+]
+# --set-date writer tags: ALL common metadata date fields.
+FORCE_PHOTO_TAGS = [
+    # EXIF
+    "EXIF:DateTimeOriginal", "EXIF:CreateDate", "EXIF:ModifyDate",
+    # XMP (common)
+    "XMP:CreateDate", "XMP:DateCreated",
+    # PNG anc
+    "PNG:CreationTime",
+]
+FORCE_VIDEO_TAGS = [
+    # QuickTime family
+    "QuickTime:CreateDate", "QuickTime:ModifyDate",
+    "MediaCreateDate", "TrackCreateDate", "TrackModifyDate",
+    # iTunes/ItemList & Keys & UserData
+    "ItemList:ContentCreateDate", "Keys:CreationDate", "UserData:CreationDate",
+    # Also set EXIF/XMP for videos when present (some tools read these)
+    "EXIF:CreateDate", "EXIF:DateTimeOriginal", "EXIF:ModifyDate",
+    "XMP:CreateDate", "XMP:DateCreated",
+]
+
+def writer_tags(kind: int, force: bool = False) -> List[str]:
+    if kind == KIND_PHOTO:
+        return FORCE_PHOTO_TAGS if force else RESTORE_PHOTO_TAGS
+    return FORCE_VIDEO_TAGS if force else RESTORE_VIDEO_TAGS
 
-def set_metadata_dates_from_value(path: Path, value: str) -> Tuple[bool,str]:
+# exiftool can only write FileCreateDate on Windows and macOS
+FS_CREATE_WRITABLE = sys.platform in ("win32", "darwin")
+FS_DATE_TAGS = ("FileCreateDate", "FileModifyDate") if FS_CREATE_WRITABLE else ("FileModifyDate",)
+
+def run_with_fs_fallback(args: List[str], fallback: List[str]) -> Tuple[bool,str]:
     """
-    Restore/sync writer (not the full "force all") – keeps previous behavior.
+    Run 'args' (which include FileCreateDate); if exiftool rejects it, retry once with
+    'fallback' (FileModifyDate only) for filesystems without a create time. Platforms where
+    exiftool can never write FileCreateDate go straight to 'fallback' in one call.
     """
-    if is_photo(path):
-        args = ["-overwrite_original",
-                f"-DateTimeOriginal={value}",
-                f"-CreateDate={value}",
-                f"-ModifyDate={value}",
-                f"-XMP:CreateDate={value}",
-                f"-XMP:DateCreated={value}",
-                str(path)]
-    else:
-        args = ["-overwrite_original",
-                f"-QuickTime:CreateDate={value}",
-                f"-QuickTime:ModifyDate={value}",
-                f"-MediaCreateDate={value}",
-                f"-TrackCreateDate={value}",
-                f"-TrackModifyDate={value}",
-                f"-ModifyDate={value}",
-                f"-ItemList:ContentCreateDate={value}",
-                f"-Keys:CreationDate={value}",
-                str(path)]
-    try:
-        out = subprocess.check_output(["exiftool", *args], stderr=subprocess.STDOUT)
-        return True, out.decode("utf-8", errors="ignore").strip()
-    except subprocess.CalledProcessError as e:
-        return False, e.output.decode(errors="ignore")
-
-def set_filesystem_dates_from_value(path: Path, value: str) -> Tuple[bool,str]:
+    if not FS_CREATE_WRITABLE:
+        args = fallback
     try:
-        out = subprocess.check_output(
-            ["exiftool","-overwrite_original",
-             f"-FileCreateDate={value}", f"-FileModifyDate={value}", str(path)],
-            stderr=subprocess.STDOUT)
+        out = run_exiftool(args)
         return True, out.decode("utf-8", errors="ignore").strip()
     except subprocess.CalledProcessError as e:
         msg = e.output.decode(errors="ignore")
+        if e.returncode == 2 or args is fallback:  # -if failed / nothing left to retry
+            return False, msg
         try:
-            out2 = subprocess.check_output(
-                ["exiftool","-overwrite_original",
-                 f"-FileModifyDate={value}", str(path)],
-                stderr=subprocess.STDOUT)
+            out2 = run_exiftool(fallback)
             return True, "(create date unsupported) " + out2.decode("utf-8", errors="ignore").strip()
         except subprocess.CalledProcessError as e2:
             return False, msg + "\n" + e2.output.decode(errors="ignore")
 
+def run_batch_with_fs_fallback(ops: List[List[str]], fallbacks: List[List[str]]) -> List[Tuple[int, bytes, bytes]]:
+    """
+    Batched run_with_fs_fallback: run_batch 'ops', then re-run every failed op (other than an
+    -if miss) once more, in a second batch, with its FileModifyDate-only twin from 'fallbacks'.
+    """
+    results = run_batch(ops) if ops else []
+    retry = [i for i, (code, _, _) in enumerate(results) if code not in (0, 2)] if FS_CREATE_WRITABLE else []
+    for i, (code, out, err) in zip(retry, run_batch([fallbacks[i] for i in retry]) if retry else []):
+        _, out1, err1 = results[i]
+        results[i] = (code, out, err) if code == 0 else (code, out1 + out, err1 + b"\n" + err)
+    return results
+
+def date_write_args(entry: FileEntry, value: str, fs_tags, force: bool = False) -> List[str]:
+    return ["-overwrite_original",
+            *(f"-{t}={value}" for t in (*writer_tags(entry.kind, force), *fs_tags)),
+            str(entry.path)]
+
+def set_all_dates(entry: FileEntry, value: str, force: bool = False) -> Tuple[bool,str]:
+    """
+    Write embedded date tags AND filesystem dates to 'value' in a single exiftool call.
+    force=True uses the wider --set-date tag list.
+    """
+    return run_with_fs_fallback(
+        date_write_args(entry, value, ("FileCreateDate", "FileModifyDate"), force),
+        date_write_args(entry, value, ("FileModifyDate",), force))
+
+# exiftool-side twin of parse_exif_dt: a full, non-zero 'YYYY:MM:DD HH:MM:SS' with optional
+# fraction and TZ. No {n} quantifiers: a brace would end the ${...} expression early.
+_VALID_DT = r"^(?!0000)\d\d\d\d:(0[1-9]|1[0-2]):(0[1-9]|[12]\d|3[01]) ([01]\d|2[0-3]):[0-5]\d:[0-5]\d(\.\d+)?(Z|[+-]\d\d:\d\d)?$"
+# exiftool advanced-formatting filters: drop the value unless it is a valid date (with a TZ suffix)
+_VALID_ONLY = rf";$_=undef unless /{_VALID_DT}/"
+_TZ_ONLY = rf";$_=undef unless /{_VALID_DT}/ and /(Z|[+-]\d\d:\d\d)$/"
+# -if expressions are interpolated first ('$/' would turn into a newline), so anchor with \z there
+_IF_VALID_DT = _VALID_DT[:-1] + r"\z"
+
+def best_copy_args(cands: Tuple[str, ...], dests: List[str]) -> List[str]:
+    """
+    exiftool args that copy the best of 'cands' onto each of 'dests' in place, guarded by an
+    -if that fails (status 2) when no candidate holds a valid date. Candidates are listed lowest
+    priority first (the last valid assignment wins), with the TZ-bearing variants after the plain
+    ones, mirroring pick_best_time_tag; zero and date-only values are skipped as parse_exif_dt
+    would reject them.
+    """
+    rev = cands[::-1]
+    sources = [*(f"${{{t}{_VALID_ONLY}}}" for t in rev), *(f"${{{t}{_TZ_ONLY}}}" for t in rev)]
+    # 'defined' first: -if fails the file on any Perl warning, such as matching a missing tag
+    return ["-if", " or ".join(f"(defined ${t} and ${t} =~ /{_IF_VALID_DT}/)" for t in cands),
+            *(f"-{d}<{s}" for d in dests for s in sources)]
+
+def restore_in_place(entry: FileEntry) -> Tuple[bool,str]:
+    """
+    No shift/offset: let exiftool pick the best embedded date and copy it onto the writer
+    tags + filesystem itself, so read and write happen in one call.
+    """
+    cands, dests, path = candidate_tags(entry.kind), writer_tags(entry.kind), str(entry.path)
+    return run_with_fs_fallback(
+        ["-overwrite_original", *best_copy_args(cands, [*dests, "FileCreateDate", "FileModifyDate"]), path],
+        ["-overwrite_original", *best_copy_args(cands, [*dests, "FileModifyDate"]), path])
+
+def fmt_time_shift(hours: float) -> str:
+    """--shift-hours as an exiftool shift string, e.g. -1.5 -> '-1:30:00'."""
+    secs = round(abs(hours) * 3600)
+    return f"{'-' if hours < 0 else '+'}{secs // 3600}:{secs % 3600 // 60:02d}:{secs % 60:02d}"
+
+def read_name_list(path: str) -> set:
+    """path_key()s of the file names exiftool wrote to an -efile list (missing file = none)."""
+    try:
+        with open(path, encoding="utf-8", errors="surrogateescape") as f:
+            return {path_key(l.rstrip("\r\n")) for l in f if l.strip()}
+    except FileNotFoundError:
+        return set()
+
+def bulk_copy(groups: Dict[int, List[str]], common: List[str], fs_tags) -> Tuple[set, set, Dict[str,str]]:
+    """
+    One run_batch op per kind in 'groups' ({kind: paths}) copying the best embedded date in
+    place. Returns (path_key()s written or unchanged, path_key()s failing the -if guard,
+    {path: error} for every other file).
+    """
+    kinds = list(groups)
+    with tempfile.TemporaryDirectory() as tmp:
+        written, skipped = os.path.join(tmp, "written.txt"), os.path.join(tmp, "skipped.txt")
+        results = run_batch([[*common, "-efile10", written, "-efile4", skipped,
+                              *best_copy_args(candidate_tags(k), [*writer_tags(k), *fs_tags]), *groups[k]]
+                             for k in kinds])
+        ok, no_date = read_name_list(written), read_name_list(skipped)
+    errors: Dict[str,str] = {}
+    for k, (_, out, err) in zip(kinds, results):
+        # exiftool error lines end in ' - <file>'
+        lines = err.decode("utf-8", errors="ignore").splitlines()
+        by_file = {path_key(l.rpartition(" - ")[2]): l for l in lines if l.startswith("Error") and " - " in l}
+        fallback = b"\n".join((out, err)).strip().decode("utf-8", errors="ignore") or "exiftool reported no result"
+        for p in groups[k]:
+            key = path_key(p)
+            if key not in ok and key not in no_date:
+                errors[p] = by_file.get(key, fallback)
+    return ok, no_date, errors
+
+def restore_folder_bulk(entries: List[FileEntry], shift_hours: float) -> Iterator[Tuple[bool,str]]:
+    """
+    Plain folder restore with no per-file Python work: one exiftool command per media kind over
+    the walked file list, batched into a single process, each copying the best embedded date in
+    place (--shift-hours maps onto -globalTimeShift). exiftool names the written and -if-failed
+    files in -efile lists, which become the per-file report lines; files that errored get one
+    FileModifyDate-only retry where FileCreateDate is written. Yields (ok, report line).
+    """
+    common = ["-overwrite_original", *(["-globalTimeShift", fmt_time_shift(shift_hours)] if shift_hours else [])]
+    groups: Dict[int, List[str]] = {}
+    for e in entries:
+        p = str(e.path)
+        why = argfile_error(p)
+        if why:  # one such name would fail its whole per-kind command, so report it alone
+            yield False, f"{p} -> Set metadata+filesystem failed: {why}"; continue
+        groups.setdefault(e.kind, []).append(p)
+    ok, no_date, errors = bulk_copy(groups, common, FS_DATE_TAGS)
+    if errors and FS_CREATE_WRITABLE:
+        retry = {k: [p for p in paths if p in errors] for k, paths in groups.items()}
+        ok2, no_date2, errors2 = bulk_copy({k: v for k, v in retry.items() if v}, common, ("FileModifyDate",))
+        ok |= ok2; no_date |= no_date2
+        errors = {p: errors[p] + "\n" + m for p, m in errors2.items()}
+    for paths in groups.values():
+        for p in paths:
+            key = path_key(p)
+            if key in ok:
+                yield True, f"{p} -> Set metadata+filesystem from best embedded date (in-place copy)"
+            elif key in no_date:
+                yield False, f"{p} -> No usable metadata date (EXIF/QuickTime/XMP)"
+            else:
+                yield False, f"{p} -> Set metadata+filesystem failed: {errors.get(p, '')}"
+
 # ---------- Restore mode ----------
-def restore_from_own_metadata(path: Path, shift_hours: float, set_offset: Optional[str]) -> Tuple[str,bool,str]:
+def restore_from_own_metadata(entry: FileEntry, shift_hours: float, set_offset: Optional[str]) -> Tuple[str,bool,str]:
+    path = entry.path
     try:
+        if not ((shift_hours and shift_hours != 0.0) or set_offset):
+            ok, m = restore_in_place(entry)
+            if not ok:
+                if "failed condition" in m:
+                    return (str(path), False, "No usable metadata date (EXIF/QuickTime/XMP)")
+                return (str(path), False, f"Set metadata+filesystem failed: {m}")
+            return (str(path), True, "Set metadata+filesystem from best embedded date (in-place copy)")
         tags = exiftool_json(path)
-        picked = pick_best_time_tag(tags, path, allow_system_fallback=False)
+        picked = pick_best_time_tag(tags, entry.kind, allow_system_fallback=False)
         if not picked:
             return (str(path), False, "No usable metadata date (EXIF/QuickTime/XMP)")
         src_tag, value = picked
         adj = apply_time_adjustments(value, shift_hours, set_offset)
-        ok1, m1 = set_metadata_dates_from_value(path, adj)
-        if not ok1:
-            return (str(path), False, f"Set metadata failed from {src_tag}={value} -> {adj}: {m1}")
-        ok2, m2 = set_filesystem_dates_from_value(path, adj)
-        if not ok2:
-            return (str(path), False, f"Metadata OK, filesystem FAILED: {m2}")
+        ok, m = set_all_dates(entry, adj)
+        if not ok:
+            return (str(path), False, f"Set metadata+filesystem failed from {src_tag}={value} -> {adj}: {m}")
         return (str(path), True, f"Set metadata+filesystem from {src_tag} = {value} -> {adj}")
     except subprocess.CalledProcessError as e:
         return (str(path), False, f"ExifTool error: {e.output.decode(errors='ignore')}")
     except Exception as e:
         return (str(path), False, f"Error: {e}")
 
-# ---------- Sync mode ----------
-def sync_copy_metadata_from_src(src: Path, dst: Path) -> Tuple[bool,str]:
-    cmd = [
-        "exiftool","-overwrite_original",
-        "-TagsFromFile", str(src),
-        "-QuickTime:CreateDate>QuickTime:CreateDate",
-        "-QuickTime:ModifyDate>QuickTime:ModifyDate",
-        "-MediaCreateDate>MediaCreateDate",
-        "-TrackCreateDate>TrackCreateDate",
-        "-TrackModifyDate>TrackModifyDate",
-        "-EXIF:CreateDate>CreateDate",
-        "-EXIF:DateTimeOriginal>DateTimeOriginal",
-        "-EXIF:ModifyDate>ModifyDate",
-        "-ItemList:ContentCreateDate>ItemList:ContentCreateDate",
-        "-Keys:CreationDate>Keys:CreationDate",
-        "-UserData:CreationDate>UserData:CreationDate",
-        "-XMP:CreateDate>XMP:CreateDate",
-        "-XMP:DateCreated>XMP:DateCreated",
-        str(dst),
-    ]
+def restore_batch(entries: List[FileEntry], shift_hours: float, set_offset: Optional[str]) -> Iterator[Tuple[bool,str]]:
+    """
+    Restore with --shift-hours/--set-offset for many files at once: one batched JSON read,
+    pick + adjust in Python, then every write in a single run_batch process (failed writes get
+    one FileModifyDate-only retry). Yields (ok, report line); nothing runs until iterated.
+    """
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return True, out.decode("utf-8","ignore").strip()
-    except subprocess.CalledProcessError as e:
-        return False, e.output.decode(errors="ignore")
+        meta = read_all_metadata([e.path for e in entries])
+    except subprocess.CalledProcessError as ex:
+        msg = ex.output.decode("utf-8", errors="ignore").strip() or "exiftool exited unexpectedly"
+        for e in entries:
+            yield False, f"{e.path} -> ExifTool error: {msg}"
+        return
+    ops: List[List[str]] = []; fallbacks: List[List[str]] = []; pending = []
+    for e in entries:
+        tags = meta.get(path_key(e.path))
+        if tags is None:
+            why = argfile_error(str(e.path))
+            yield False, f"{e.path} -> " + (f"Error: {why}" if why else "ExifTool could not read this file"); continue
+        picked = pick_best_time_tag(tags, e.kind, allow_system_fallback=False)
+        if not picked:
+            yield False, f"{e.path} -> No usable metadata date (EXIF/QuickTime/XMP)"; continue
+        src_tag, value = picked
+        try:
+            adj = apply_time_adjustments(value, shift_hours, set_offset)
+        except ValueError as ex:
+            yield False, f"{e.path} -> Error: {ex}"; continue
+        ops.append(date_write_args(e, adj, FS_DATE_TAGS))
+        fallbacks.append(date_write_args(e, adj, ("FileModifyDate",)))
+        pending.append((e.path, src_tag, value, adj))
+    for (path, src_tag, value, adj), (code, out, err) in zip(pending, run_batch_with_fs_fallback(ops, fallbacks)):
+        if code != 0:
+            m = b"\n".join((out, err)).strip().decode("utf-8", errors="ignore")
+            yield False, f"{path} -> Set metadata+filesystem failed from {src_tag}={value} -> {adj}: {m}"
+        else:
+            yield True, f"{path} -> Set metadata+filesystem from {src_tag} = {value} -> {adj}"
+
+# ---------- Sync mode ----------
+SYNC_COPY_TAGS = [
+    "-QuickTime:CreateDate>QuickTime:CreateDate",
+    "-QuickTime:ModifyDate>QuickTime:ModifyDate",
+    "-MediaCreateDate>MediaCreateDate",
+    "-TrackCreateDate>TrackCreateDate",
+    "-TrackModifyDate>TrackModifyDate",
+    "-EXIF:CreateDate>CreateDate",
+    "-EXIF:DateTimeOriginal>DateTimeOriginal",
+    "-EXIF:ModifyDate>ModifyDate",
+    "-ItemList:ContentCreateDate>ItemList:ContentCreateDate",
+    "-Keys:CreationDate>Keys:CreationDate",
+    "-UserData:CreationDate>UserData:CreationDate",
+    "-XMP:CreateDate>XMP:CreateDate",
+    "-XMP:DateCreated>XMP:DateCreated",
+]
+
+def sync_copy_dates_from_src(src: str, dst: Path) -> Tuple[bool,str]:
+    """
+    Copy embedded dates AND filesystem timestamps from 'src' in a single -TagsFromFile call.
+    """
+    meta = ["-overwrite_original", "-TagsFromFile", src, *SYNC_COPY_TAGS]
+    return run_with_fs_fallback(
+        [*meta, "-FileCreateDate<FileCreateDate", "-FileModifyDate<FileModifyDate", str(dst)],
+        [*meta, "-FileModifyDate<FileModifyDate", str(dst)])
 
-def sync_copy_filesystem_dates_from_src(src: Path, dst: Path) -> Tuple[bool,str]:
+def sync_from_source(src: str, dst: FileEntry, shift_hours: float, set_offset: Optional[str]) -> Tuple[bool,str]:
     try:
-        out = subprocess.check_output(
-            ["exiftool","-overwrite_original",
-             "-TagsFromFile", str(src),
-             "-FileCreateDate<FileCreateDate",
-             "-FileModifyDate<FileModifyDate",
-             str(dst)],
-            stderr=subprocess.STDOUT)
-        return True, out.decode("utf-8","ignore").strip()
+        ok, m = sync_copy_dates_from_src(src, dst.path)
+        if not ok: return False, f"Copy metadata + filesystem dates failed: {m}"
+        if (shift_hours and shift_hours != 0.0) or set_offset:
+            # re-read the target: not every source tag transfers, and it keeps its own others
+            picked = pick_best_time_tag(exiftool_json(dst.path), dst.kind, allow_system_fallback=False)
+            if not picked:
+                return False, "Post-sync shift requested but no usable metadata date found"
+            _, value = picked
+            adj = apply_time_adjustments(value, shift_hours, set_offset)
+            ok, _ = set_all_dates(dst, adj)
+            if not ok:
+                return False, "Post-sync shift failed to apply"
+            return True, f"Synced then shifted -> {adj}"
+        return True, "Synced metadata + filesystem (exact copy)"
     except subprocess.CalledProcessError as e:
-        msg = e.output.decode(errors="ignore")
-        try:
-            out2 = subprocess.check_output(
-                ["exiftool","-overwrite_original",
-                 "-TagsFromFile", str(src),
-                 "-FileModifyDate<FileModifyDate",
-                 str(dst)],
-                stderr=subprocess.STDOUT)
-            return True, "(create date unsupported) " + out2.decode("utf-8","ignore").strip()
-        except subprocess.CalledProcessError as e2:
-            return False, msg + "\n" + e2.output.decode(errors="ignore")
+        return False, f"ExifTool error: {e.output.decode(errors='ignore')}"
+    except Exception as e:
+        return False, f"Error: {e}"
 
-def sync_from_source(src: Path, dst: Path, shift_hours: float, set_offset: Optional[str]) -> Tuple[bool,str]:
-    ok1, m1 = sync_copy_metadata_from_src(src, dst)
-    if not ok1: return False, f"Copy metadata failed: {m1}"
-    ok2, m2 = sync_copy_filesystem_dates_from_src(src, dst)
-    if not ok2: return False, f"Copy filesystem dates failed: {m2}"
-    if (shift_hours and shift_hours != 0.0) or set_offset:
-        tags = exiftool_json(dst)
-        picked = pick_best_time_tag(tags, dst, allow_system_fallback=False)
+def sync_batch(entries: List[FileEntry], sources: List[Optional[str]], src_folder: Optional[Path],
+               shift_hours: float, set_offset: Optional[str]) -> Iterator[Tuple[bool,str]]:
+    """
+    Sync with --shift-hours/--set-offset for many files at once: all copies in one run_batch
+    process, one batched JSON read of the copied targets, pick + adjust in Python, then all
+    shifted writes in a second process (failed writes get one FileModifyDate-only retry).
+    Yields (ok, report line); nothing runs until iterated.
+    """
+    copies: List[List[str]] = []; pending = []
+    for e, src in zip(entries, sources):
+        if src is None:
+            yield False, f"{e.path} :: No match in {src_folder} by basename"; continue
+        # the shifted write replaces the filesystem dates anyway, so the copy skips them
+        copies.append(["-overwrite_original", "-TagsFromFile", src, *SYNC_COPY_TAGS, str(e.path)])
+        pending.append((e, src))
+    copied = []
+    for (e, src), (code, out, err) in zip(pending, run_batch(copies) if copies else []):
+        if code != 0:
+            m = b"\n".join((out, err)).strip().decode("utf-8", errors="ignore")
+            yield False, f"{e.path} <- {src} :: Copy metadata + filesystem dates failed: {m}"
+        else:
+            copied.append((e, src))
+    try:
+        meta = read_all_metadata([e.path for e, _ in copied])
+    except subprocess.CalledProcessError as ex:
+        msg = ex.output.decode("utf-8", errors="ignore").strip() or "exiftool exited unexpectedly"
+        for e, src in copied:
+            yield False, f"{e.path} <- {src} :: ExifTool error: {msg}"
+        return
+    writes = []
+    for e, src in copied:
+        picked = pick_best_time_tag(meta.get(path_key(e.path)) or {}, e.kind, allow_system_fallback=False)
         if not picked:
-            return False, "Post-sync shift requested but no usable metadata date found"
-        _, value = picked
-        adj = apply_time_adjustments(value, shift_hours, set_offset)
-        okm, _ = set_metadata_dates_from_value(dst, adj)
-        okf, _ = set_filesystem_dates_from_value(dst, adj)
-        if not (okm and okf):
-            return False, "Post-sync shift failed to apply"
-        return True, f"Synced then shifted -> {adj}"
-    return True, "Synced metadata + filesystem (exact copy)"
+            yield False, f"{e.path} <- {src} :: Post-sync shift requested but no usable metadata date found"; continue
+        try:
+            adj = apply_time_adjustments(picked[1], shift_hours, set_offset)
+        except ValueError as ex:
+            yield False, f"{e.path} <- {src} :: Error: {ex}"; continue
+        writes.append((e, src, adj))
+    done = run_batch_with_fs_fallback([date_write_args(e, adj, FS_DATE_TAGS) for e, _, adj in writes],
+                                      [date_write_args(e, adj, ("FileModifyDate",)) for e, _, adj in writes])
+    for (e, src, adj), (code, _, _) in zip(writes, done):
+        if code != 0:
+            yield False, f"{e.path} <- {src} :: Post-sync shift failed to apply"
+        else:
+            yield True, f"{e.path} <- {src} :: Synced then shifted -> {adj}"
 
 # ---------- Force-set mode ----------
-def force_set_all_dates(path: Path, set_date_str: str, shift_hours: float, set_offset: Optional[str]) -> Tuple[str,bool,str]:
+def force_set_all_dates(entry: FileEntry, set_date_str: str, shift_hours: float, set_offset: Optional[str]) -> Tuple[str,bool,str]:
     """
     Force all metadata date fields + FS timestamps to a specific date/time.
     """
+    path = entry.path
     try:
         # normalize user input, then apply optional shift/offset
         base = normalize_input_datetime(set_date_str)
         adj = apply_time_adjustments(base, shift_hours, set_offset)
-        ok1, m1 = set_all_metadata_dates(path, adj)
-        if not ok1:
-            return (str(path), False, f"Set ALL metadata failed for {adj}: {m1}")
-        ok2, m2 = set_filesystem_dates_from_value(path, adj)
-        if not ok2:
-            return (str(path), False, f"Metadata OK, filesystem FAILED: {m2}")
+        ok, m = set_all_dates(entry, adj, force=True)
+        if not ok:
+            return (str(path), False, f"Set ALL metadata + FS failed for {adj}: {m}")
         return (str(path), True, f"ALL metadata + FS set to {adj}")
     except subprocess.CalledProcessError as e:
         return (str(path), False, f"ExifTool error: {e.output.decode(errors='ignore')}")
@@ -387,75 +811,140 @@ def force_set_all_dates(path: Path, set_date_str: str, shift_hours: float, set_o
         return (str(path), False, f"Error: {e}")
 
 # ---------- Discovery ----------
-def expand_file_argument(arg: str) -> List[Path]:
+def expand_file_argument(arg: str) -> List[FileEntry]:
     p = Path(arg)
     if p.suffix:
-        candidate = p if p.exists() else (Path.cwd() / p)
-        return [candidate] if candidate.exists() and candidate.is_file() and not is_hidden(candidate) else []
+        candidate = file_entry(p if p.exists() else (Path.cwd() / p))
+        return [candidate] if not candidate.is_hidden and candidate.path.is_file() else []
     else:
         directory = p.parent if str(p.parent) not in ("",".") else Path.cwd()
         basename = p.name
-        candidates = [c for c in directory.glob(basename + ".*") if c.is_file() and not is_hidden(c)]
-        if (directory / basename).exists() and (directory / basename).is_file() and not is_hidden(directory / basename):
-            candidates.append(directory / basename)
-        uniq, seen = [], set()
-        for c in candidates:
-            rp = c.resolve()
-            if rp not in seen:
-                seen.add(rp); uniq.append(c)
-        return uniq
-
-def iter_folder(folder: Path, recursive: bool) -> List[Path]:
-    if recursive:
-        return [p for p in folder.rglob("*") if p.is_file() and not is_hidden(p)]
-    else:
-        return [p for p in folder.iterdir() if p.is_file() and not is_hidden(p)]
+        # One scandir pass instead of glob: names are compared literally (glob metacharacters in
+        # 'basename' are harmless) and DirEntry.is_file() usually needs no extra stat. Names in a
+        # directory are unique and the bare name can't carry the prefix, so no dedup is needed.
+        prefix = os.path.normcase(basename + ".")
+        try:
+            with os.scandir(directory) as it:
+                candidates = [file_entry(Path(d.path), d.name) for d in it
+                              if os.path.normcase(d.name).startswith(prefix) and d.is_file()]
+        except OSError:
+            candidates = []
+        candidates = [e for e in candidates if not e.is_hidden]
+        # is_file() is False for missing paths, so no separate exists() stat
+        bare = file_entry(directory / basename)
+        if not bare.is_hidden and bare.path.is_file():
+            candidates.append(bare)
+        return candidates
 
-def build_source_index(src_folder: Path, recursive: bool, case_insensitive: bool):
-    index = defaultdict(lambda: defaultdict(list))  # key -> ext -> [paths]
-    iterator = src_folder.rglob("*") if recursive else src_folder.iterdir()
-    for p in iterator:
+def walk_files(folder: Path, recursive: bool) -> Iterator[os.DirEntry]:
+    """
+    Non-hidden files under 'folder' via os.scandir, in rglob's pre-order. DirEntry type checks
+    come from readdir's d_type, so regular files cost no extra stat. Unreadable dirs are skipped.
+    """
+    stack = [str(folder)]
+    while stack:
+        subdirs = []
         try:
-            if p.is_file() and not is_hidden(p):
-                stem = p.stem.lower() if case_insensitive else p.stem
-                index[stem][p.suffix.lower()].append(p)
-        except PermissionError:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if recursive and e.is_dir(follow_symlinks=False):
+                        subdirs.append(e.path)
+                    elif not e.name.startswith(".") and e.is_file():
+                        yield e
+        except OSError:  # unreadable, or removed while walking
             continue
-    return index
-
-def find_source_match(index, target: Path, case_insensitive: bool) -> Optional[Path]:
-    key = target.stem.lower() if case_insensitive else target.stem
-    ext = target.suffix.lower()
-    if key in index and ext in index[key] and index[key][ext]:
-        return index[key][ext][0]
-    if key in index:
-        for _, lst in index[key].items():
-            if lst: return lst[0]
-    return None
+        stack.extend(reversed(subdirs))
+
+def iter_folder(folder: Path, recursive: bool) -> List[FileEntry]:
+    return [file_entry(Path(e.path), e.name) for e in walk_files(folder, recursive)]
+
+def build_source_index(src_folder: Path, recursive: bool, case_insensitive: bool):
+    """
+    Flat basename index: ({(stem, ext): path}, {stem: path}), first hit wins in both.
+    Paths are kept as the plain strings scandir gives; no Path object per source file.
+    """
+    by_key: Dict[Tuple[str,str], str] = {}
+    by_stem: Dict[str, str] = {}
+    for e in walk_files(src_folder, recursive):
+        stem, ext = os.path.splitext(e.name)
+        stem = sys.intern(stem.lower() if case_insensitive else stem)
+        key = (stem, ext.lower())
+        if key in by_key:
+            continue
+        p = by_key[key] = e.path
+        by_stem.setdefault(stem, p)
+    return by_key, by_stem
+
+def match_all(targets: List[FileEntry], index, case_insensitive: bool) -> List[Optional[str]]:
+    """
+    Source match for every target (aligned with 'targets'), resolved in one tight pass up front:
+    exact (stem, ext) first, then stem only.
+    """
+    by_key, by_stem = index
+    stems = [t.stem.lower() for t in targets] if case_insensitive else [t.stem for t in targets]
+    return [by_key.get((k, t.suffix)) or by_stem.get(k) for k, t in zip(stems, targets)]
+
+# ---------- Worker ----------
+def process_target(entry: FileEntry, args, src: Optional[str], src_folder: Optional[Path]) -> Tuple[bool,str]:
+    """
+    Run the selected mode on one target and return (ok, report line). Called from worker threads.
+    In sync mode 'src' is the target's already-resolved source (None when nothing matched).
+    """
+    path = entry.path
+    if args.set_date is not None:
+        res_path, ok, msg = force_set_all_dates(entry, args.set_date, args.shift_hours, args.set_offset)
+        return ok, f"{res_path} -> {msg}"
+    if args.sync_from is not None:
+        if src is None:
+            return False, f"{path} :: No match in {src_folder} by basename"
+        ok, msg = sync_from_source(src, entry, args.shift_hours, args.set_offset)
+        return ok, f"{path} <- {src} :: {msg}"
+    res_path, ok, msg = restore_from_own_metadata(entry, args.shift_hours, args.set_offset)
+    return ok, f"{res_path} -> {msg}"
+
+def run_pool(targets: List[FileEntry], args, sources: List[Optional[str]], src_folder) -> Iterator[Tuple[bool,str]]:
+    """
+    process_target over a --jobs thread pool ('sources' aligned with 'targets'), yielding
+    (ok, line) as each file completes. The mode functions package their own errors, so results
+    are yielded without a per-file try. Pending work is cancelled if the consumer stops early (e.g. Ctrl-C).
+    """
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as ex:
+        futures = [ex.submit(process_target, entry, args, src, src_folder)
+                   for entry, src in zip(targets, sources)]
+        try:
+            for fut in as_completed(futures):
+                yield fut.result()
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
 
 # ---------- CLI ----------
-def build_parser() -> argparse.ArgumentParser:
-    epilog = (
-        "Examples:\n"
-        f"  {APP_NAME} --file myvideo\n"
-        f"  {APP_NAME} --folder /path/media --recursive\n"
-        f"  {APP_NAME} --folder /path/encoded --sync-date-from /path/originals\n"
-        f"  {APP_NAME} --file /path/encoded/movie.mp4 --sync-date-from /path/originals/movie.mov\n"
-        f"  # Force ALL dates (metadata + FS) to 2024-01-01 12:00:00+07:00\n"
-        f"  {APP_NAME} --folder /path/media --set-date \"2024-01-01 12:00:00+07:00\"\n"
-        f"  # Or set then add 7 hours & suffix\n"
-        f"  {APP_NAME} --folder /path/media --set-date \"2024:01:01 05:00:00\" --shift-hours 7 --set-offset +07:00\n"
-        "\nNotes:\n"
-        "  - Hidden files (prefix '.') are ignored.\n"
-        "  - Restore mode uses only metadata dates (no System:* fallback).\n"
-        "  - Sync mode copies metadata and filesystem timestamps exactly from the source.\n"
-        "  - --set-date overrides restore/sync logic and writes the chosen date to ALL tags.\n"
-        "  - Datetime input accepted: 'YYYY:MM:DD HH:MM:SS', 'YYYY-MM-DD HH:MM:SS', or ISO 'YYYY-MM-DDTHH:MM:SS', optional 'Z' or '±HH:MM'.\n"
-    )
+DEFAULT_JOBS = (os.cpu_count() or 1) * 2
+OUTPUT_BATCH = 256  # status lines per stdout write unless --stream
+
+EPILOG = (
+    "Examples:\n"
+    f"  {APP_NAME} --file myvideo\n"
+    f"  {APP_NAME} --folder /path/media --recursive\n"
+    f"  {APP_NAME} --folder /path/encoded --sync-date-from /path/originals\n"
+    f"  {APP_NAME} --file /path/encoded/movie.mp4 --sync-date-from /path/originals/movie.mov\n"
+    f"  # Force ALL dates (metadata + FS) to 2024-01-01 12:00:00+07:00\n"
+    f"  {APP_NAME} --folder /path/media --set-date \"2024-01-01 12:00:00+07:00\"\n"
+    f"  # Or set then add 7 hours & suffix\n"
+    f"  {APP_NAME} --folder /path/media --set-date \"2024:01:01 05:00:00\" --shift-hours 7 --set-offset +07:00\n"
+    "\nNotes:\n"
+    "  - Hidden files (prefix '.') are ignored.\n"
+    "  - Restore mode uses only metadata dates (no System:* fallback).\n"
+    "  - Sync mode copies metadata and filesystem timestamps exactly from the source.\n"
+    "  - --set-date overrides restore/sync logic and writes the chosen date to ALL tags.\n"
+    "  - Datetime input accepted: 'YYYY:MM:DD HH:MM:SS', 'YYYY-MM-DD HH:MM:SS', or ISO 'YYYY-MM-DDTHH:MM:SS', optional 'Z' or '±HH:MM'.\n"
+)
+
+def build_parser() -> "argparse.ArgumentParser":
+    import argparse  # only the CLI needs it; importing this module for its helpers stays cheap
     p = argparse.ArgumentParser(
         prog=APP_NAME,
         description="Restore/sync/force-set media dates: update embedded EXIF/QuickTime/XMP metadata AND filesystem timestamps (no UTC conversion).",
-        epilog=epilog,
+        epilog=EPILOG,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     p.add_argument("--version", action="version", version=f"%(prog)s {VERSION}")
@@ -464,6 +953,8 @@ def build_parser() -> argparse.ArgumentParser:
     g.add_argument("--folder", dest="folder", help="Target folder. Use --recursive for subfolders.")
     p.add_argument("--recursive", action="store_true", help="Process subfolders (with --folder).")
     p.add_argument("--quiet", action="store_true", help="Minimal output.")
+    p.add_argument("--stream", action="store_true",
+                   help=f"Write each status line as soon as its file finishes (default: batches of {OUTPUT_BATCH}).")
     p.add_argument("--sync-date-from", dest="sync_from",
                    help="Sync dates from source file (with --file) or source folder (with --folder, match by basename).")
     p.add_argument("--src-recursive", dest="src_recursive", action=argparse.BooleanOptionalAction, default=True,
@@ -475,6 +966,8 @@ def build_parser() -> argparse.ArgumentParser:
                    help="Add/subtract hours to the chosen timestamp before writing (e.g., 7 or -7).")
     p.add_argument("--set-offset", dest="set_offset", default=None,
                    help="Force timezone suffix in metadata (e.g., +07:00 or Z). Optional.")
+    p.add_argument("--jobs", dest="jobs", type=int, default=DEFAULT_JOBS,
+                   help=f"Files processed in parallel, each worker with its own exiftool (default: {DEFAULT_JOBS}).")
     # NEW: Force set all dates
     p.add_argument("--set-date", dest="set_date", default=None,
                    help="Force ALL metadata dates + filesystem to this datetime (e.g., '2024:01:01 12:00:00+07:00').")
@@ -501,66 +994,55 @@ def main(argv=None):
         print(c("[INFO] Nothing to do.", Colors.YELLOW)); return
 
     # Prepare sync sources
-    src_index = None; src_file = None; src_folder = None
+    sources: List[Optional[str]] = [None] * len(targets); src_folder = None
     if sync_mode:
         src = Path(args.sync_from)
         if args.file:
             if not src.exists() or not src.is_file():
                 print(c(f"[ERROR] Source file does not exist: {src}", Colors.RED)); sys.exit(2)
-            src_file = src
+            sources = [str(src)] * len(targets)
         else:
             if not src.exists() or not src.is_dir():
                 print(c(f"[ERROR] Source folder does not exist: {src}", Colors.RED)); sys.exit(2)
             src_folder = src
             src_index = build_source_index(src_folder, args.src_recursive, args.case_insensitive)
+            sources = match_all(targets, src_index, args.case_insensitive)
+
+    adjust = (args.shift_hours and args.shift_hours != 0.0) or args.set_offset
+    if not force_mode and not sync_mode and args.folder and not args.set_offset:
+        # Plain folder restore (optionally shifted): one exiftool command per kind, in place
+        results = restore_folder_bulk(targets, args.shift_hours)
+    elif not force_mode and not sync_mode and adjust:
+        # Adjusted restore: batch-read every target, pick/adjust in Python, batch-write
+        results = restore_batch(targets, args.shift_hours, args.set_offset)
+    elif not force_mode and sync_mode and adjust:
+        # Adjusted sync: batch the copies, re-read the targets in one go, then batch the writes
+        results = sync_batch(targets, sources, src_folder, args.shift_hours, args.set_offset)
+    else:
+        results = run_pool(targets, args, sources, src_folder)
 
+    # report lines carry file names, which need not be valid in the console's encoding
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(errors="backslashreplace")
     processed = succeeded = failed = 0
-    for path in targets:
-        processed += 1
-        try:
-            if force_mode:
-                res_path, ok, msg = force_set_all_dates(path, args.set_date, args.shift_hours, args.set_offset)
-                if ok:
-                    succeeded += 1
-                    if not args.quiet: print(c("[OK] ", Colors.GREEN) + f"{res_path} -> {msg}")
-                else:
-                    failed += 1
-                    print(c("[FAIL] ", Colors.RED) + f"{res_path} -> {msg}")
-            elif sync_mode:
-                if src_file is not None:
-                    ok, msg = sync_from_source(src_file, path, args.shift_hours, args.set_offset)
-                    if ok:
-                        succeeded += 1
-                        if not args.quiet: print(c("[OK] ", Colors.GREEN) + f"{path} <- {src_file} :: {msg}")
-                    else:
-                        failed += 1
-                        print(c("[FAIL] ", Colors.RED) + f"{path} <- {src_file} :: {msg}")
-                else:
-                    match = find_source_match(src_index, path, args.case_insensitive) if src_index else None
-                    if not match:
-                        failed += 1
-                        print(c("[FAIL] ", Colors.RED) + f"{path} :: No match in {src_folder} by basename")
-                        continue
-                    ok, msg = sync_from_source(match, path, args.shift_hours, args.set_offset)
-                    if ok:
-                        succeeded += 1
-                        if not args.quiet: print(c("[OK] ", Colors.GREEN) + f"{path} <- {match} :: {msg}")
-                    else:
-                        failed += 1
-                        print(c("[FAIL] ", Colors.RED) + f"{path} <- {match} :: {msg}")
+    batch = 1 if args.stream else OUTPUT_BATCH
+    out: List[str] = []
+    try:
+        for ok, line in results:
+            processed += 1
+            if ok:
+                succeeded += 1
+                if args.quiet: continue
+                out.append(OK_PREFIX + line)
             else:
-                res_path, ok, msg = restore_from_own_metadata(path, args.shift_hours, args.set_offset)
-                if ok:
-                    succeeded += 1
-                    if not args.quiet: print(c("[OK] ", Colors.GREEN) + f"{res_path} -> {msg}")
-                else:
-                    failed += 1
-                    print(c("[FAIL] ", Colors.RED) + f"{res_path} -> {msg}")
-        except KeyboardInterrupt:
-            print(c("\n[INFO] Interrupted by user.", Colors.YELLOW)); break
-        except Exception as e:
-            failed += 1
-            print(c("[FAIL] ", Colors.RED) + f"{path} -> Unexpected error: {e}")
+                failed += 1
+                out.append(FAIL_PREFIX + line)
+            if len(out) >= batch:
+                sys.stdout.write("\n".join(out) + "\n"); out.clear()
+                if args.stream: sys.stdout.flush()
+    except KeyboardInterrupt:
+        out.append(c("\n[INFO] Interrupted by user.", Colors.YELLOW))
+    if out: sys.stdout.write("\n".join(out) + "\n")
 
     print(f"\nSummary: processed={processed}, success={succeeded}, failed={failed}")
     if failed > 0: sys.exit(1)